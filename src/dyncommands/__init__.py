@@ -29,12 +29,19 @@ Use :py:func:`operator.getitem` instead of subscripts, and :py:exc:`ImproperUsag
 them to roll dice and sends the output of the roll to the source.
 
 """
+from importlib import import_module as _import_module
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+from typing import Any as _Any
+
 from ._version import __version__
 from ._version import __version_info__
-from .models import CommandContext
-from .models import CommandSource
-from .parser import Command
-from .parser import CommandParser
+
+if _TYPE_CHECKING:  # pragma: no cover
+    # Resolved lazily by __getattr__ at runtime; imported here so static type checkers keep their types
+    from .models import CommandContext
+    from .models import CommandSource
+    from .parser import Command
+    from .parser import CommandParser
 
 __all__ = (
     'Command',
@@ -45,3 +52,24 @@ __all__ = (
 
 __author__ = 'Cubicpath@Github <cubicpath@pm.me>'
 """Author's information."""
+
+_LAZY_ATTRS: dict[str, str] = {
+    'Command': 'parser',
+    'CommandContext': 'models',
+    'CommandParser': 'parser',
+    'CommandSource': 'models',
+}
+"""Public attribute names mapped to the submodule they are imported from on first access. See :pep:`562`."""
+
+
+def __getattr__(name: str) -> _Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value: _Any = getattr(_import_module(f'.{_LAZY_ATTRS[name]}', __name__), name)
+    globals()[name] = value  # Cache so __getattr__ is not called again for this name
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
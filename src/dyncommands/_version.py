@@ -10,6 +10,18 @@
 __version_info__ = (1, 3, 0, 'final', 0)
 """Major, Minor, Micro, Release level, Serial in respective order."""
 
+__version__ = '1.3'  # Keep in sync with __version_info__; equal to _stringify(*__version_info__)
+"""String representation of version number."""
+
+_RELEASE_SUFFIXES: dict[str, str] = {
+    'a': 'a', 'alpha': 'a',
+    'b': 'b', 'beta': 'b',
+    'c': 'rc', 'rc': 'rc', 'candidate': 'rc',
+    'pre': 'pre', 'preview': 'pre',
+    'final': '', 'release': '',
+}
+"""Known release levels mapped to their normalized :pep:`440` pre-release suffix."""
+
 
 def _stringify(major: int, minor: int, micro: int = 0, releaselevel: str = 'final', serial: int = 0, **kwargs) -> str:
     """Stringifies a version number based on version info given. Follows :pep:`440`.
@@ -77,7 +89,6 @@ def _stringify(major: int, minor: int, micro: int = 0, releaselevel: str = 'fina
     releaselevel = releaselevel.strip()
     separators:     tuple[str, ...] = ('', '.', '-', '_')
     post_spellings: tuple[str, ...] = ('post', 'rev', 'r')
-    release_levels: tuple[str, ...] = ('a', 'b', 'c', 'rc', 'pre', 'alpha', 'beta', 'candidate', 'preview', 'final', 'release')
 
     for attr in ('major', 'minor', 'micro', 'local_ver', 'post', 'dev', 'dev_post'):
         if vars()[attr] is not None and not isinstance(vars()[attr], int):
@@ -87,21 +98,15 @@ def _stringify(major: int, minor: int, micro: int = 0, releaselevel: str = 'fina
         raise ValueError(f'A separator given is not in allowed separators {separators}')
     if post_spelling not in post_spellings:
         raise ValueError(f'Post-release spelling not allowed as "{post_spelling}"')
-    if releaselevel not in release_levels:
+    if releaselevel not in _RELEASE_SUFFIXES:
         raise ValueError(f'Release level "{releaselevel}" is not in known release levels')
 
     v_number: str = f'{major}.{minor}'
     v_number += f'.{micro}' if micro else ''
 
-    if releaselevel and releaselevel not in ('final', 'release'):
-        if releaselevel in ('candidate', 'c'):
-            releaselevel = 'rc'
-        if releaselevel in ('alpha', 'beta'):
-            releaselevel = releaselevel[0]
-        if releaselevel == 'preview':
-            releaselevel = 'pre'
-        v_number += pre_sep
-        v_number += releaselevel if len(releaselevel) <= 3 else releaselevel[0]
+    pre_suffix: str = _RELEASE_SUFFIXES[releaselevel]
+    if pre_suffix:
+        v_number += f'{pre_sep}{pre_suffix}'
         v_number += f'{pre_ver_sep}{serial}' if serial else ''
 
     if post is not None:
@@ -119,7 +124,3 @@ def _stringify(major: int, minor: int, micro: int = 0, releaselevel: str = 'fina
         v_number += f'+{local + local_ver_sep}{local_ver}'
 
     return v_number
-
-
-__version__ = _stringify(*__version_info__)
-"""String representation of version number."""
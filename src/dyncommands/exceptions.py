@@ -22,22 +22,39 @@ class UnrestrictedWarning(UserWarning):
 
 class CommandError(Exception):
     """General exception for :py:class:`Node` execution."""
+    __slots__ = ('command', 'context', '_parent', '_is_own_parent')
+
     def __init__(self, command: Optional[Node], context: CommandContext, parent: Exception = None, message: str = None) -> None:
-        self.command: Optional[Node] = command
-        self.context: CommandContext = context
-        self.parent:  Exception = parent
+        self.command:        Optional[Node] = command
+        self.context:        CommandContext = context
+        self.parent:         Optional[Exception] = parent
         name = command.name if command else 'Unknown'
         super().__init__(f"'{context.source.display_name}' failed executing the '{name}' command." if message is None else message)
 
+    @property
+    def parent(self) -> Optional[Exception]:
+        """:return: The exception that caused this error, or this error itself if it was raised directly."""
+        return self if self._is_own_parent else self._parent
+
+    @parent.setter
+    def parent(self, value: Optional[Exception]) -> None:
+        """Set the exception that caused this error. This error itself is kept as a flag, to avoid a reference cycle."""
+        self._parent:        Optional[Exception] = None if value is self else value
+        self._is_own_parent: bool = value is self
+
 
 class DisabledError(CommandError):
     """Error when attempting to execute a disabled :py:class:`Node`."""
+    __slots__ = ()
+
     def __init__(self, command: Node, context: CommandContext) -> None:
         super().__init__(command, context, self, f"'{command.name}' is disabled, enable to execute.")
 
 
 class ImproperUsageError(CommandError):
     """Error for when a :py:class:`Node` is improperly used (manually triggered by :py:class:`Node`)."""
+    __slots__ = ()
+
     def __init__(self, command: Node, context: CommandContext, message: str = None) -> None:
         super().__init__(command, context, self, f"Incorrect usage of '{command.name}'. To view usage information, use '!#prefix#!help "
                                                  f"{command.name}'." if message is None else message)
@@ -45,6 +62,8 @@ class ImproperUsageError(CommandError):
 
 class NoPermissionError(CommandError):
     """Error for attempting to execute a :py:class:`Node` without required permissions."""
+    __slots__ = ()
+
     def __init__(self, command: Node, context: CommandContext) -> None:
         super().__init__(command, context, self, f"'{context.source.display_name}' did not have the required permissions "
                                                  f"({context.source.permission}/{command.permission}) to use the '{command.name}' command.")
@@ -52,5 +71,8 @@ class NoPermissionError(CommandError):
 
 class NotFoundError(CommandError):
     """Error executing a non-existent :py:class:`Node` name."""
+    __slots__ = ('name',)
+
     def __init__(self, name: str, context: CommandContext) -> None:
         super().__init__(None, context, self, f"'{name}' is not a registered command.")
+        self.name: str = name
@@ -3,12 +3,13 @@
 ###################################################################################################
 """Simple object models that are easily extensible and used during parsing."""
 from collections.abc import Callable
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 from typing import Optional
 from typing import Union
 
-from requests.structures import CaseInsensitiveDict
-
+from .utils import CaseInsensitiveDict
 from .utils import DUMMY_FUNC
 
 
@@ -19,10 +20,16 @@ __all__ = (
     'Node'
 )
 
+_NODE_KWARGS: frozenset[str] = frozenset(('parent', 'name', 'usage', 'description', 'permission', 'children', 'disabled'))
+"""Key-word arguments supported by :py:class:`Node`."""
+
+_EMPTY_CHILDREN: Mapping[str, Any] = MappingProxyType(CaseInsensitiveDict())
+"""Read-only children shared by every :py:class:`Node` without children, until one is added."""
+
 
 class Node:
     """Common object that stores metadata and child :py:class:`Node` s."""
-    __slots__ = ('_parent', '_name', 'usage', 'description', 'permission', 'children', 'disabled')
+    __slots__ = ('_parent', '_name', '_lower_name', '_path', 'usage', 'description', 'permission', 'children', 'disabled')
 
     def __init__(self, **kwargs) -> None:
         """Initialize and load any kwargs as attributes.
@@ -38,29 +45,45 @@ class Node:
         :keyword disabled: (bool) Metadata.
         :raises ValueError: For unexpected kwargs
         """
-        self._parent:       Optional['Node'] = kwargs.pop('parent', None)
-        self._name:         str = kwargs.pop('name', '')
-        self.usage:         str = kwargs.pop('usage', '')
-        self.description:   str = kwargs.pop('description', '')
-        self.permission:    int = kwargs.pop('permission', 0)
-        self.children:      CaseInsensitiveDict['Node'] = CaseInsensitiveDict(
-            {props['name']: Node(parent=self, **props) for props in kwargs.pop('children', [])}
-        )
-        self.disabled:      bool = kwargs.pop('disabled', False)
+        if not _NODE_KWARGS.issuperset(kwargs):
+            raise ValueError('Unexpected key-word argument: ' + next(iter(kwargs.keys() - _NODE_KWARGS)))
+
+        self._parent:       Optional['Node'] = kwargs.get('parent')
+        self._name:         str = kwargs.get('name', '')
+        self._lower_name:   str = self._name.lower()
+        self._path:         Optional[str] = None
+        self.usage:         str = kwargs.get('usage', '')
+        self.description:   str = kwargs.get('description', '')
+        self.permission:    int = kwargs.get('permission', 0)
+        self.children:      Mapping[str, 'Node'] = _EMPTY_CHILDREN
+        self.disabled:      bool = kwargs.get('disabled', False)
+
+        for props in kwargs.get('children', ()):
+            # Children register themselves with their parent
+            Node(parent=self, **props)
 
         if self._parent is not None:
-            self._parent.children.update({self.name: self})
-
-        if kwargs:
-            raise ValueError('Unexpected key-word argument: ' + kwargs.popitem()[0])
+            self._parent._mutable_children().set_lower(self._lower_name, self._name, self)
 
     def __eq__(self, other: Any) -> bool:
-        if isinstance(other, Node):
-            return other is self or (self.parent == other.parent and self.name == other.name)
-        return False
+        if not isinstance(other, Node):
+            return False
+
+        # Compare names along both parent chains, until they reach a shared node or both end
+        node: Optional[Node] = self
+        other_node: Optional[Node] = other
+        while node is not other_node:
+            if node is None or other_node is None or node._name != other_node._name:
+                return False
+            # Nodes that are their own parent end their chain
+            node = node._parent if node._parent is not node else None
+            other_node = other_node._parent if other_node._parent is not other_node else None
+        return True
 
     def __str__(self) -> str:
-        return f'{(str(self.parent) + "__") if (self.parent is not None and self.parent is not self) else "root:__"}{self.name}'
+        if self._path is None:
+            self._path = f'{(str(self.parent) + "__") if (self.parent is not None and self.parent is not self) else "root:__"}{self.name}'
+        return self._path
 
     @property
     def name(self) -> str:
@@ -73,10 +96,14 @@ class Node:
 
         :param value: Node or None to set as parent.
         """
+        lower_value: str = value.lower()
         if self._parent is not None:
-            self._parent.children.pop(self.name)
-            self._parent.children.update({value: self})
+            children: CaseInsensitiveDict[Node] = self._parent._mutable_children()
+            children.pop_lower(self._lower_name)
+            children.set_lower(lower_value, value, self)
         self._name = value
+        self._lower_name = lower_value
+        self._clear_path()
 
     @property
     def parent(self) -> Optional['Node']:
@@ -90,10 +117,27 @@ class Node:
         :param value: Node or None to set as parent.
         """
         if self._parent is not None:
-            self._parent.children.pop(self.name)
+            self._parent._mutable_children().pop_lower(self._lower_name)
         if value is not None:
-            value.children.update({self.name: self})
+            value._mutable_children().set_lower(self._lower_name, self._name, self)
         self._parent = value
+        self._clear_path()
+
+    def _clear_path(self) -> None:
+        """Clear the cached :py:meth:`__str__` value of this :py:class:`Node` and all of its descendants."""
+        stack: list[Node] = [self]
+        while stack:
+            node: Node = stack.pop()
+            if node._path is not None:
+                node._path = None
+                # A node without a cached path has no descendants with a cached path
+                stack.extend(node.children.values())
+
+    def _mutable_children(self) -> CaseInsensitiveDict['Node']:
+        """:return: self.children, replacing the shared read-only empty children with a new :py:class:`CaseInsensitiveDict` first."""
+        if self.children is _EMPTY_CHILDREN:
+            self.children = CaseInsensitiveDict()
+        return self.children
 
     def add_children(self, *children: 'Node') -> None:
         """Add children to self.children and set their parent as self.
@@ -109,10 +153,10 @@ class Node:
         :param children: Either name of node or a Node object to search through self for.
         """
         for child in children:
-            if child in self.children.values():
-                child.parent = None
-            elif child in self.children.keys():
-                self.children.get(child).parent = None
+            node: Optional[Node] = self.children.get(child.name if isinstance(child, Node) else child)
+            # Only remove Node objects that are the actual child, not just one with the same name
+            if node is not None and (node is child or not isinstance(child, Node)):
+                node.parent = None
 
 
 class CommandSource:
@@ -123,6 +167,10 @@ class CommandSource:
     __slots__ = ('display_name', 'permission', '_feedback_callback')
 
     def __init__(self, feedback_callback: Callable[[str, ...], None] = DUMMY_FUNC) -> None:
+        """Create a source with an empty display name and a permission level of 0.
+
+        :param feedback_callback: Called with feedback sent to this source. Defaults to the shared no-op :py:data:`DUMMY_FUNC`.
+        """
         self.display_name: str = ''
         self.permission:   int = 0
         self._feedback_callback = feedback_callback
@@ -152,8 +200,13 @@ class CommandContext:
     """Full context for parsing and executing a command from a :py:class:`CommandSource`."""
     __slots__ = ('_source', '_working_string')
 
-    def __init__(self, working_string: str = '', source: CommandSource = CommandSource()) -> None:
-        self._source:         CommandSource = source
+    def __init__(self, working_string: str = '', source: Optional[CommandSource] = None) -> None:
+        """Create a context for parsing a string.
+
+        :param working_string: String to parse.
+        :param source: Source of the string. Defaults to a shared source that discards all feedback.
+        """
+        self._source:         CommandSource = source if source is not None else _NULL_SOURCE
         self._working_string: str = working_string
 
     @property
@@ -165,3 +218,24 @@ class CommandContext:
     def working_string(self) -> str:
         """Original string sent for parsing."""
         return self._working_string
+
+
+class _NullSource(CommandSource):
+    """Read-only :py:class:`CommandSource` that discards all feedback."""
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """Create a source with an empty display name and a permission level of 0."""
+        object.__setattr__(self, 'display_name', '')
+        object.__setattr__(self, 'permission', 0)
+        object.__setattr__(self, '_feedback_callback', DUMMY_FUNC)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{type(self).__name__!r} object is read-only')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__!r} object is read-only')
+
+
+_NULL_SOURCE: CommandSource = _NullSource()
+"""Source used by every :py:class:`CommandContext` created without one. Read-only, as it is shared."""
@@ -3,10 +3,18 @@
 ###################################################################################################
 """Main command parser module for Dynamic Commands."""
 import json
+import marshal
 import operator
+import os
+from ast import literal_eval
 from collections.abc import Callable
+from collections.abc import Mapping
+from functools import cache
+from hashlib import blake2b
+from importlib.util import MAGIC_NUMBER
 from pathlib import Path
 from platform import python_implementation as _impl
+from types import CodeType
 from typing import Any
 from typing import Optional
 from typing import Union
@@ -26,6 +34,25 @@ if _impl() == 'CPython':
 else:
     warn(ImportWarning('RestrictedPython is not supported on non-CPython implementations, and will not be imported.'))  # pragma: no cover
 
+try:  # pragma: no cover
+    from orjson import OPT_APPEND_NEWLINE
+    from orjson import OPT_INDENT_2
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as json_loads
+
+    def json_dumps(obj: Any) -> bytes:
+        """:return: Indented JSON representation of obj as UTF-8 bytes, ending with a newline."""
+        return _orjson_dumps(obj, option=OPT_INDENT_2 | OPT_APPEND_NEWLINE)
+
+except ImportError:  # pragma: no cover
+    from json import dumps as _json_dumps
+    from json import loads as json_loads
+
+    def json_dumps(obj: Any) -> bytes:
+        """:return: Indented JSON representation of obj as UTF-8 bytes, ending with a newline."""
+        return (_json_dumps(obj, indent=2) + '\n').encode('utf8')
+
+from ._version import __version__
 from .exceptions import *
 from .models import *
 from .schemas import *
@@ -54,26 +81,199 @@ if _impl() == 'CPython':
     class _CommandPolicy(RestrictingNodeTransformer):
         ...
 
+_BYTECODE_DIGEST_SIZE: int = 16
+
+_BYTECODE_CACHE: dict[str, tuple[tuple[int, int, bool], CodeType]] = {}
+"""Module paths mapped to the (mtime, size, unrestricted) stamp and bytecode they were last compiled with. Shared between parsers."""
+
+_TAG_CHAR: str = '\U000e0000'
+"""Unicode tag character some chat clients append to repeated messages. Stripped from the end of working strings."""
+
+_UNPROXIED_TYPES: frozenset[type] = frozenset((str, int, float, bool, bytes, type(None)))
+"""Immutable types without private state, passed to restricted commands without a :py:class:`PrivateProxy`. Subclasses are still proxied."""
+
+_DOC_MARKERS: frozenset[str] = frozenset(('"""', "'''"))
+"""Markers that open and close a docstring in add_command."""
+
+_LOAD_ERRORS: tuple[type[Exception], ...] = (FileNotFoundError, SyntaxError, NotImplementedError)
+"""Exceptions raised when a command module is missing or cannot be compiled."""
+
+_METADATA_FIELDS: dict[str, tuple[int, type]] = {
+    '#name': (0, str),
+    '#usage': (1, str),
+    '#description': (2, str),
+    '#permission': (3, int),
+}
+"""Simplified metadata comment keys mapped to their index in add_command's command_data, and the type to cast their value to."""
+
+
+@cache
+def _bytecode_tag() -> bytes:
+    """:return: Included in bytecode cache keys, so cached bytecode is invalidated when the interpreter,
+        dyncommands, RestrictedPython, or the command policy changes.
+    """
+    tag: str = f'dyncommands {__version__}'
+    if _impl() == 'CPython':
+        # Only needed once bytecode is cached, and slow to import
+        from importlib.metadata import PackageNotFoundError  # pylint: disable=import-outside-toplevel
+        from importlib.metadata import version  # pylint: disable=import-outside-toplevel
+
+        try:
+            restricted_version: str = version('RestrictedPython')
+        except PackageNotFoundError:
+            # Vendored and zipapp installs may not ship distribution metadata
+            restricted_version = 'unknown'
+        tag += f' RestrictedPython {restricted_version} {_CommandPolicy.__module__}.{_CommandPolicy.__qualname__}'
+    return MAGIC_NUMBER + tag.encode('utf8')
+
+
+def _bytecode_cache_path(module_path: Path) -> Path:
+    """:return: Path of the file the bytecode of a command module is cached in."""
+    return module_path.parent / '__pycache__' / f'{module_path.stem}.dyncommands.pyc'
+
+
+def _find_command(commands: list[Mapping[str, Any]], name: str) -> int:
+    """:return: Index of the command with the given name in commands, or -1 if not found."""
+    for index, command in enumerate(commands):
+        if command['name'] == name:
+            return index
+    return -1
+
+
+def _scan_module_lines(lines: list[str], command_data: list[Any]) -> tuple[str, int, bytearray, set[tuple[int, int]]]:
+    """Read metadata comments above the command function into command_data, and find the lines to remove from the module.
+
+    :return: Name and line index of the command function definition, a flag per line that is 0 if the line is removed, and (line, char) indices to cut lines at.
+    """
+    func_name:       str = ''
+    func_line:       int = 0
+    lines_to_keep:   bytearray = bytearray(b'\x01') * len(lines)
+    lines_to_sub_at: set[tuple[int, int]] = set()
+    doc_marker:      str = ''  # Marker of the multi-line docstring currently being skipped
+
+    for i, line in enumerate(lines):
+        stripped: str = line.strip()
+
+        # If ''' or """ in line
+        if '"""' in line or "'''" in line:
+
+            # When starting a docstring
+            if not doc_marker:
+                marker: str = stripped[:3]
+                if marker in _DOC_MARKERS:
+                    second_doc: int = line.find(marker, line.index(marker) + 3)
+                    if second_doc == -1:
+                        # Multi-line docstring
+                        doc_marker = marker
+                    else:
+                        # Single-line docstring
+                        lines_to_sub_at.add((i, second_doc + 3))
+                    continue
+
+            # When ending a multi-line docstring
+            elif doc_marker in line:
+                lines_to_sub_at.add((i, line.index(doc_marker) + 3))
+                doc_marker = ''
+                continue
+
+        # If line is not currently in a multi-line docstring
+        if not doc_marker:
+
+            # If function hasn't yet been defined
+            if not func_name:
+
+                if line.startswith('def'):
+                    func_name = stripped.removeprefix('def ').split('(')[0]
+                    func_line = i
+                    continue
+
+                # Remove all non-comment/empty lines above function definition
+                if stripped and not stripped.startswith('#'):
+                    lines_to_keep[i] = 0
+                    continue
+
+                key, sep, value = stripped.partition(':')
+                if not sep:
+                    # Comments without a colon, such as banners, are never metadata
+                    continue
+
+                # Key of a metadata comment, ignoring case and whitespace
+                metadata_key: str = key.replace(' ', '').replace('\t', '').lower()
+                value = value.strip()
+
+                if metadata_key == '#children' and not command_data[4]:
+                    children: Any
+                    try:
+                        # Python literal, with either quote style
+                        children = literal_eval(value)
+                    except (SyntaxError, ValueError, TypeError, MemoryError, RecursionError):
+                        try:
+                            # JSON spellings, such as true and null
+                            children = json.loads(value)
+                        except (ValueError, RecursionError):
+                            children = None
+                    if isinstance(children, list) and all(isinstance(child, dict) for child in children):
+                        command_data[4] = children
+                    continue
+
+                field: Optional[tuple[int, type]] = _METADATA_FIELDS.get(metadata_key)
+                if field is not None and not command_data[field[0]]:
+                    index, cast = field
+                    try:
+                        # Get string value after the key and cast to the field's type
+                        command_data[index] = cast(value)
+                    except (TypeError, ValueError):
+                        pass
+
+            else:
+                # Remove non-comment lines outside of function's scope
+                if stripped and not line.startswith((' ', '\t')):
+                    if not stripped.startswith('#'):
+                        lines_to_keep[i] = 0
+
+    return func_name, func_line, lines_to_keep, lines_to_sub_at
+
+
+def _strip_module_lines(lines: list[str], func_name: str, func_line: int, lines_to_keep: bytearray, lines_to_sub_at: set[tuple[int, int]]) -> list[str]:
+    """:return: Lines of the command module, without the lines found by :py:func:`_scan_module_lines` and with the function renamed to 'command'."""
+    for line_num, char_num in lines_to_sub_at:
+        # Substring all marked lines from start to specified index
+        lines[line_num] = lines[line_num][:char_num] + '\n'
+
+    # Replace function name with generic name 'command', while line indices still match the source
+    lines[func_line] = lines[func_line].strip().replace(f'def {func_name}', 'def command', 1) + '\n'
+    return [line for line, keep in zip(lines, lines_to_keep) if keep]
+
 
 # noinspection PyProtectedMember
 class Command(Node):
     """Dynamic command object. Created on demand by a :py:class:`CommandParser`."""
-    __slots__ = ('_function',)
+    __slots__ = ('_data', '_function', '_loaded')
 
     def __init__(self, data: Optional[CommandData], parser: 'CommandParser') -> None:
-        """Build :py:class:`Command` from :py:class:`ParserData` and matching zzz__ modules."""
+        """Build :py:class:`Command` from :py:class:`ParserData` and matching zzz__ modules.
+
+        Unless the parser preloads modules, a command's module is loaded when the command is first executed.
+        """
         super().__init__()
-        self._function: Callable = DUMMY_FUNC
+        self._data:     Optional[CommandData] = data
+        self._function: Optional[Callable] = DUMMY_FUNC
+        self._loaded:   Optional[tuple[CodeType, Callable]] = None  # Bytecode last executed, and the function it defined
         if data is not None:
             self.name = data.name  # String; required
             self.usage = data.usage  # String
             self.description = data.description  # String
             self.permission = data.permission  # Integer; min of -1
-            self.children = CaseInsensitiveDict({props.name: Node(parent=self, **props) for props in data.children})
             self.disabled = data.disabled  # Boolean
 
+            for props in data.children:
+                # Children register themselves with their parent
+                Node(parent=self, **props)
+
             if data.function is True:  # True, False, and None
-                parser._load_module(self)
+                self._function = None  # Not loaded yet
+                if parser._preload:
+                    parser._load_module(self)
 
     def __call__(self, *args, **kwargs) -> Optional[str]:
         """Syntax sugar for :py:method:`Command._execute`."""
@@ -95,15 +295,22 @@ class Command(Node):
 
         final_node: Node = self
         for arg in args:
-            final_node = final_node.children.get(arg, final_node)
+            children: Mapping[str, Node] = final_node.children
+            if not children:
+                # No later arg can match a deeper node
+                break
+            final_node = children.get(arg, final_node)
 
         if not self.disabled and not final_node.disabled:
             # Get permission level of last argument with properties, or the command itself if no args with properties
             if context.source.has_permission(final_node.permission) or parser._ignore_permission:
                 if not parser._unrestricted:
                     # Proxy public attributes of kwargs; exclude Path attributes
-                    kwargs = {kwarg: PrivateProxy(kwval, parser._should_hide_attr) for kwarg, kwval in kwargs.items()}
+                    hide_attr: Callable[[str, Any], bool] = parser._should_hide_attr
+                    kwargs = {kwarg: kwval if type(kwval) in _UNPROXIED_TYPES else PrivateProxy(kwval, hide_attr) for kwarg, kwval in kwargs.items()}
                 try:
+                    if self._function is None:
+                        parser._load_module(self)
                     return self._function(*args, **kwargs)
                 except Exception as e:
                     raise CommandError(self, context, e) from e
@@ -115,23 +322,32 @@ class Command(Node):
 class CommandParser:
     """Keeps track of all commands and command metadata. Allows for dynamic execution of commands through string parsing."""
 
-    def __init__(self, commands_path: Union[str, Path], silent: bool = False, ignore_permission: bool = False, unrestricted: Union[bool, None] = None) -> None:
+    def __init__(self, commands_path: Union[str, Path], silent: bool = False, ignore_permission: bool = False, unrestricted: Union[bool, None] = None,
+                 cache_bytecode: bool = False, preload: bool = False) -> None:
         """Create a new Parser and load all command data from the given path.
 
         :param silent: If true, stops all debug printing.
         :param ignore_permission: If true, permission level is not taken into account when executing a command.
         :param unrestricted: If true, disables RestrictedPython compilation of command modules. Defaults to True when running on non-CPython implementations.
+        :param cache_bytecode: If true, compiled command modules are cached in the __pycache__ directory of the commands_path.
+            Cached bytecode is executed without being restricted again, so only enable this if nobody untrusted can write to that directory.
+        :param preload: If true, command modules are loaded during reload instead of when each command is first executed.
         """
         if unrestricted is None:
             unrestricted = False if _impl() == 'CPython' else True
 
         self.commands:            CaseInsensitiveDict[Command] = CaseInsensitiveDict()
         self.command_data:        list[CommandData] = []
-        self.path:                Path = Path(commands_path)
+        self.path:                Path = Path(commands_path)  # Also sets _json_path
+        self._cache_bytecode:     bool = cache_bytecode
         self._command_prefix:     str = '/'
         self._current_command:    Optional[Command] = None
         self._delimiting_str:     str = ' '
+        self._hidden_attrs:       dict[tuple[str, type], bool] = {}
+        self._json_cache:         Optional[tuple[tuple[int, int], dict[str, Any]]] = None
+        self._reloaded_json:      Optional[dict[str, Any]] = None  # Decoded commands.json the commands were last built from
         self._ignore_permission:  bool = ignore_permission
+        self._preload:            bool = preload
         self._silent:             bool = silent
         self._unrestricted:       bool = unrestricted
 
@@ -144,6 +360,19 @@ class CommandParser:
         """Syntax sugar for self.parse."""
         self.parse(context=context, **kwargs)
 
+    @property
+    def path(self) -> Path:
+        """:return: Directory containing the commands.json file and command modules."""
+        return self._path
+
+    @path.setter
+    def path(self, value: Union[str, Path]) -> None:
+        """Set the commands directory, and cache the paths of the files inside it."""
+        self._path:      Path = Path(value)
+        self._json_path: Path = self._path / 'commands.json'
+        self._temp_path: Path = self._path / f'commands.json.{os.getpid()}.tmp'
+        self._json_cache = None
+
     @property
     def prefix(self) -> str:
         """:return: The current prefix needed to recognize if the given string is a command."""
@@ -152,74 +381,194 @@ class CommandParser:
     @prefix.setter
     def prefix(self, value) -> None:
         """Set the current prefix both in memory and in the commands.json file."""
-        json_path: Path = self.path / 'commands.json'
         self._command_prefix = value
-        with json_path.open(mode='r', encoding='utf8') as file:
-            new_json: dict[str, Any] = json.load(file)
-            new_json['commandPrefix'] = self._command_prefix
-        with json_path.open(mode='w', encoding='utf8') as file:
-            json.dump(new_json, file, indent=2)
+        new_json: dict[str, Any] = dict(self._read_json())
+        new_json['commandPrefix'] = self._command_prefix
+        self._write_json(new_json)
+
+    def _compile_module(self, module_path: Path) -> CodeType:
+        """Compile a command module, reusing bytecode compiled in this process if the module has not been modified since.
+
+        :raises FileNotFoundError: If the module does not exist.
+        :raises SyntaxError: If the module cannot be compiled.
+        """
+        stat = module_path.stat()
+        stamp:          tuple[int, int, bool] = (stat.st_mtime_ns, stat.st_size, self._unrestricted)
+        memory_cached:  Optional[tuple[tuple[int, int, bool], CodeType]] = _BYTECODE_CACHE.get(str(module_path))
+
+        if memory_cached is not None and memory_cached[0] == stamp:
+            return memory_cached[1]
+
+        byte_code: CodeType = self._read_or_compile_module(module_path)
+        _BYTECODE_CACHE[str(module_path)] = (stamp, byte_code)
+        return byte_code
+
+    def _read_or_compile_module(self, module_path: Path) -> CodeType:
+        """Compile a command module, reusing bytecode from the __pycache__ directory if the module's source is unchanged.
+
+        :raises FileNotFoundError: If the module does not exist.
+        :raises SyntaxError: If the module cannot be compiled.
+        """
+        source: bytes = module_path.read_bytes()
+        if not self._cache_bytecode:
+            return self._compile_source(source, module_path)
+
+        key:        bytes = blake2b(source + _bytecode_tag() + bytes((self._unrestricted,)), digest_size=_BYTECODE_DIGEST_SIZE).digest()
+        cache_path: Path = _bytecode_cache_path(module_path)
+        try:
+            cached: bytes = cache_path.read_bytes()
+            if cached[:_BYTECODE_DIGEST_SIZE] == key:
+                return marshal.loads(cached[_BYTECODE_DIGEST_SIZE:])
+        except (OSError, EOFError, TypeError, ValueError):
+            pass
+
+        byte_code: CodeType = self._compile_source(source, module_path)
+        temp_path: Path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            temp_path.write_bytes(key + marshal.dumps(byte_code))
+            # Atomically replace, so other processes never read a partially written cache
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.print(f'Could not cache bytecode of {module_path}: {e}')
+
+        return byte_code
+
+    def _compile_source(self, source: bytes, module_path: Path) -> CodeType:
+        """Compile a command module's source, restricted unless the parser is unrestricted.
+
+        :raises SyntaxError: If the source cannot be compiled.
+        """
+        # Compile straight from bytes; the parser decodes the source itself, and reports invalid UTF-8 as a SyntaxError.
+        # RestrictedPython instantiates the policy class per compilation, as each instance collects that module's errors
+        if not self._unrestricted:
+            return safe_compile(source, filename=str(module_path), mode='exec', policy=_CommandPolicy)
+        return compile(source, filename=str(module_path), mode='exec')
 
     # pylint: disable=exec-used
     def _load_module(self, command: Command) -> None:
         """Loads a command's respective python code from storage."""
-        module_path: Path = self.path / f'zzz__{command.name}.py'
+        module_path: Path = self._module_path(command.name)
         locals_:     dict[str, Any] = {}
 
         try:
-            with module_path.open(mode='r', encoding='utf8') as file:
-                # Attempt to compile code and run function definition
-                plaintext_code = file.read()
-                if not self._unrestricted:
-                    # Restricted
-                    byte_code = safe_compile(plaintext_code, filename=str(module_path), mode='exec', policy=_CommandPolicy)
-                    exec(byte_code, command_globals, locals_)
-                else:
-                    # Unrestricted
-                    globals_ = globals().copy()
-                    globals_.update(__file__=str(module_path), __package__=None)
-                    byte_code = compile(plaintext_code, filename=str(module_path), mode='exec')
-                    exec(byte_code, globals_, locals_)
-
-        except (FileNotFoundError, SyntaxError, NotImplementedError) as e:
-            self.print(str(e))
-            self.print(f"Discarding broken command '{command.name}' from {module_path}.")
+            # Attempt to compile code and run function definition
+            byte_code: CodeType = self._compile_module(module_path)
+            if command._loaded is not None and command._loaded[0] is byte_code:
+                # Module is unchanged since it was last executed
+                command._function = command._loaded[1]
+                return
+
+            if not self._unrestricted:
+                # Restricted
+                exec(byte_code, command_globals, locals_)
+            else:
+                # Unrestricted
+                # Each module gets its own copy, as the functions it defines keep their globals
+                globals_ = dict(globals(), __file__=str(module_path), __package__=None)
+                exec(byte_code, globals_, locals_)
+
+        except Exception as e:  # A module body can raise anything, not only _LOAD_ERRORS
+            self.print(e, f"Discarding broken command '{command.name}' from {module_path}.", sep='\n')
+            command._function = DUMMY_FUNC
             self.remove_command(command.name)
 
         else:
             self.print(f"Loading file {module_path} from disk into '{command.name}'.")
             command._function = locals_.get('command', DUMMY_FUNC)
+            command._loaded = (byte_code, command._function)
+
+    def _module_path(self, name: str) -> Path:
+        """:return: Path of the module for the command with the given name."""
+        return self._path / f'zzz__{name}.py'
+
+    def _read_json(self) -> dict[str, Any]:
+        """Decode the commands.json file, reusing the last decoded contents if the file has not been modified since.
+
+        :return: Decoded contents of the commands.json file. Shared between calls, so copy any part before modifying it.
+        """
+        stat = self._json_path.stat()
+        stamp: tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+
+        if self._json_cache is None or self._json_cache[0] != stamp:
+            # Decode from bytes, so the file doesn't have to be decoded to text first
+            self._json_cache = (stamp, json_loads(self._json_path.read_bytes()))
+        return self._json_cache[1]
+
+    def _write_json(self, data: dict[str, Any]) -> None:
+        """Replace the contents of the commands.json file with data, encoded in a single call."""
+        self._json_cache = None
+        self._temp_path.write_bytes(json_dumps(data))
+        # Atomically replace, so commands.json is never left partially written
+        os.replace(self._temp_path, self._json_path)
 
     def _should_hide_attr(self, name: str, o: Any) -> bool:
         if self._unrestricted:
             return False
 
-        # Include already proxied objects
-        return not isinstance(o, PrivateProxy) and (
-                isinstance(o, Path) or  # Exclude Path attributes
-                name.startswith('_')    # Exclude protected attributes
-        )
+        # The result only depends on the attribute name and value type
+        key:    tuple[str, type] = (name, type(o))
+        hidden: Optional[bool] = self._hidden_attrs.get(key)
+        if hidden is None:
+            # Include already proxied objects
+            hidden = self._hidden_attrs[key] = not isinstance(o, PrivateProxy) and (
+                    isinstance(o, Path) or  # Exclude Path attributes
+                    name.startswith('_')    # Exclude protected attributes
+            )
+        return hidden
 
     def reload(self) -> None:
         """Load all data from the commands.json file in the commands_path.
         For every :py:class:`CommandData` object in the :py:class:`ParserData`, a :py:class:`Command` object is constructed and assigned with the same name.
+        Commands whose data is unchanged since the last reload are kept, and only have their module reloaded.
 
         :raises FileNotFoundError: If parser cannot find the commands.json file
         """
-        json_path: Path = self.path / 'commands.json'
-
-        if json_path.exists():
-            with json_path.open(mode='r', encoding='utf8') as file:
-                json_data: ParserData = ParserData(json.load(file))
-                json_data.validate(json_data)
-
+        if self._json_path.exists():
+            raw_json: dict[str, Any] = self._read_json()
+            if raw_json is self._reloaded_json:
+                # commands.json is unchanged since the last reload, so only the modules need reloading
+                # Copied, as broken modules remove their command while reloading
+                for command in list(self.commands.values()):
+                    self._reload_module(command)
+                return
+
+            json_data: ParserData = ParserData(raw_json)
+            json_data.validate(json_data)
+
+            # Each access of ParserData.commands builds a new list
+            command_data: list[CommandData] = json_data.commands
             self._command_prefix = json_data.commandPrefix
-            self.command_data = json_data.commands
-            self.commands = CaseInsensitiveDict({command.name: Command(command, self) for command in self.command_data})
+            self.command_data = command_data
+
+            previous: CaseInsensitiveDict[Command] = self.commands
+            self.commands = CaseInsensitiveDict()
+            for data in command_data:
+                command: Optional[Command] = previous.get(data.name)
+                if command is None or command._data != data:
+                    command = Command(data, self)
+                else:
+                    self._reload_module(command)
+                self.commands[data.name] = command
+
+            if self.command_data is not command_data:
+                # Broken modules were discarded while loading, so drop their commands from the rebuilt dict
+                self.commands = CaseInsensitiveDict({data.name: self.commands[data.name] for data in self.command_data})
+            self._reloaded_json = raw_json
 
         else:
             raise FileNotFoundError(f'commands.json not in commands_path ({self.path})')
 
+    def _reload_module(self, command: Command) -> None:
+        """Mark the module of a kept command for reloading, as it may have changed on disk.
+
+        Its function is reused if the bytecode is unchanged. Modules that previously failed to load are retried.
+        """
+        if command._data is not None and command._data.function is True:
+            command._function = None
+            if self._preload:
+                self._load_module(command)
+
     def parse(self, context: CommandContext, **kwargs) -> None:
         """Parse a :py:class:`CommandContext`'s working_string for commands and arguments, then execute them.
 
@@ -233,18 +582,25 @@ class CommandParser:
         :raises NotFoundError: When command specified in the contextual working string is not found in the command data.
         """
 
-        input_: str = context.working_string.removeprefix(self.prefix).rstrip('\U000e0000').strip()
+        # The prefix is optional, so every working string is tokenized.
+        # removeprefix and rstrip only scan the ends of the string, and return it unchanged when there is nothing to remove
+        input_: str = context.working_string.removeprefix(self._command_prefix).rstrip(_TAG_CHAR).strip()
         if input_:
-            split: list[str] = input_.split(self._delimiting_str)
-            name, args = split[0], split[1:]
-            if self.commands.get(name) is not None:
-                kwargs.update({'context': context, 'parser': self})
+            delimiter: str = self._delimiting_str
+            # Only split arguments when there are any, and leave the command name out of the split
+            name, _, rest = input_.partition(delimiter)
+            args: Union[list[str], tuple[()]] = rest.split(delimiter) if rest else ()
+            command: Optional[Command] = self.commands.get(name)
+            if command is not None:
+                kwargs['context'] = context
+                kwargs['parser'] = self
                 try:
                     # Call command function with args and kwargs
-                    return_val = self.commands[name](*args, **kwargs)
+                    return_val = command(*args, **kwargs)
                     if return_val is not None:
                         # Return Value, if any
-                        context.source.send_feedback(str(return_val), context.source.display_name)
+                        source: CommandSource = context.source
+                        source.send_feedback(str(return_val), source.display_name)
                 except CommandError as e:
                     self.print(e.parent.__class__.__name__ + " while executing command: " + str(e.parent))
                     if isinstance(e.parent, ImproperUsageError):
@@ -257,6 +613,32 @@ class CommandParser:
             else:
                 raise NotFoundError(name, context)
 
+    def compile_modules(self) -> list[str]:
+        """Compile every command module ahead of time, without executing them. Compiled bytecode is cached on disk if cache_bytecode is enabled.
+
+        :return: Names of commands whose modules were compiled. Modules that fail to compile are skipped.
+        """
+        compiled: list[str] = []
+        for data in self.command_data:
+            if data.function is True:
+                try:
+                    self._compile_module(self._module_path(data.name))
+                except _LOAD_ERRORS as e:
+                    self.print(f"Could not compile command '{data.name}': {e}")
+                else:
+                    compiled.append(data.name)
+        return compiled
+
+    def available_commands(self, source: CommandSource) -> list[Command]:
+        """Get every :py:class:`Command` a :py:class:`CommandSource` is able to execute, in a single pass.
+
+        :param source: Source to check permissions of.
+        :return: Commands that are not disabled, and that the source has the required permission level for.
+        """
+        ignore_permission: bool = self._ignore_permission
+        has_permission: Callable[[int], bool] = source.has_permission
+        return [command for command in self.commands.values() if not command.disabled and (ignore_permission or has_permission(command.permission))]
+
     def print(self, *values: object, sep: Optional[str] = None, end: Optional[str] = None, file: Optional[object] = None, flush: bool = False) -> None:
         """Print if not self._silent."""
         if not self._silent:
@@ -269,22 +651,20 @@ class CommandParser:
         :param value: Whether disabled or not.
         :return: If disabled state successfully changed.
         """
-        json_path: Path = self.path / 'commands.json'
+        raw_json: dict[str, Any] = self._read_json()
+        commands: list[dict[str, Any]] = raw_json['commands']
+        index:    int = _find_command(commands, command_name)
 
-        with json_path.open(mode='r', encoding='utf8') as file:
-            data:     ParserData = ParserData(json.load(file))
-            commands: dict[str, CommandData] = {command.name: command for command in data.commands}
-
-            if commands.get(command_name, CommandData.empty()).overridable is not False:
-                commands[command_name].disabled = value
-                self.commands.get(command_name).disabled = value
-            else:
-                return False
+        if index == -1 or commands[index].get('overridable') is False:
+            return False
 
-            data.commands = list(commands.values())
+        commands = commands.copy()
+        commands[index] = {**commands[index], 'disabled': value}
+        self._write_json({**raw_json, 'commands': commands})
 
-        with json_path.open(mode='w', encoding='utf8') as file:
-            json.dump(data, file, indent=2)
+        command: Optional[Command] = self.commands.get(command_name)
+        if command is not None:
+            command.disabled = value
 
         return True
 
@@ -317,9 +697,6 @@ class CommandParser:
         :param kwargs: kwargs to override data read from text.
         :return: Name of command added if successful, else empty string.
         """
-        def get_data(line_: str, name_: str) -> str:
-            return ireplace(line_, name_, '', 1).split(':', 1)[1].strip()
-
         text = get_raw_text(text) if link else text
         lines = text.splitlines(True)
         command_data:    list[Any] = [
@@ -329,98 +706,11 @@ class CommandParser:
             kwargs.pop('permission', 0),
             kwargs.pop('children', [])
         ]
-        func_name:       str = ''
-        func_line:       int = 0
-        lines_to_remove: set = set()
-        lines_to_sub_at: set[tuple[int, int]] = set()
-        in_docstring:    bool = False
-        doc_markers:     tuple[str, str] = ('"""', "'''")
-
-        for i, line in enumerate(lines):
-            simple:      str = line.replace(' ', '').replace('\t', '').strip().lower()
-            uncommented: str = line.strip().removeprefix('#')
-
-            # If ''' or """ in line
-            if True in (marker in line for marker in doc_markers):
-                do_continue: bool = False
-                for marker in doc_markers:
-
-                    # When starting a docstring
-                    if simple.startswith(marker) and not in_docstring:
-                        try:
-                            second_doc: int = simple.index(marker, simple.index(marker) + 1)
-                        except ValueError:
-                            # Multi-line docstring
-                            in_docstring = True
-                        else:
-                            # Single-line docstring
-                            lines_to_sub_at.add((i, second_doc + len(marker)))
-                        finally:
-                            do_continue = True
-
-                    # When ending a multi-line docstring
-                    elif marker in simple and in_docstring:
-                        in_docstring = False
-                        lines_to_sub_at.add((i, line.index(marker) + len(marker)))
-                        do_continue = True
-
-                if do_continue:
-                    continue
-
-            # If line is not currently in a multi-line docstring
-            if not in_docstring:
-
-                # If function hasn't yet been defined
-                if not func_name:
-
-                    if line.startswith('def'):
-                        func_name = line.strip().removeprefix('def ').split('(')[0].replace('_', '-')
-                        command_data[0] = func_name if not command_data[0] else command_data[0]
-                        func_line = i
-                        continue
-
-                    # Remove all non-comment/empty lines above function definition
-                    if simple and not simple.startswith('#'):
-                        lines_to_remove.add(i)
-                        continue
-
-                    if simple.startswith('#children') and not command_data[4]:
-                        try:
-                            as_json = '{"data": ' + get_data(uncommented, 'children').translate(str.maketrans("'", '"')) + '}'
-                            command_data[4] = json.loads(as_json)['data']
-                        except (TypeError, ValueError):
-                            pass
-                        continue
-
-                    for x, var in enumerate(('name', 'usage', 'description', 'permission')):
-                        default: Any = command_data[x]
-                        if simple.startswith(f'#{var}') and not default:
-                            try:
-                                # Get string value and cast to type of default value
-                                command_data[x] = type(default)(get_data(uncommented, var))
-                            except (TypeError, ValueError):
-                                pass
-                            break
-
-                else:
-                    # Remove non-comment lines outside of function's scope
-                    if simple != '' and not (line.startswith(' ') or line.startswith('\t')):
-                        if not simple.startswith('#'):
-                            lines_to_remove.add(i)
+        func_name, func_line, lines_to_keep, lines_to_sub_at = _scan_module_lines(lines, command_data)
 
         if func_name:
-            for i in lines_to_remove:
-                # Mark lines for removal with a NULL char
-                lines.insert(i, lines.pop(i).replace('\n', '\0\n'))
-
-            for tup in lines_to_sub_at:
-                # Substring all marked lines from start to specified index
-                line_num, char_num = tup
-                lines.insert(line_num, lines.pop(line_num)[:char_num] + '\n')
-
-            lines = [line for line in lines if not line.endswith('\0')]
-            # Replace function name with generic name 'command'
-            lines.insert(func_line, lines.pop(func_line).strip().replace(f'def {func_name}', 'def command', 1) + '\n')
+            command_data[0] = command_data[0] or func_name.replace('_', '-')
+            lines = _strip_module_lines(lines, func_name, func_line, lines_to_keep, lines_to_sub_at)
 
             new_data: CommandData = CommandData(
                 name=command_data[0],
@@ -433,28 +723,42 @@ class CommandParser:
                 disabled=False
             )
 
-            json_path:   Path = self.path / 'commands.json'
-            module_path: Path = self.path / f'zzz__{new_data.name}.py'
+            module_path: Path = self._module_path(new_data.name)
 
-            with json_path.open(mode='r', encoding='utf8') as json_file:
-                data: ParserData = ParserData(json.load(json_file))
+            raw_json: dict[str, Any] = self._read_json()
+            commands: list[dict[str, Any]] = raw_json['commands']
+            index:    int = _find_command(commands, new_data.name)
 
-            commands: dict[str, CommandData] = {command.name: command for command in data.commands}
-
-            if commands.get(new_data.name, CommandData.empty()).overridable is not False:
-                commands[new_data.name] = new_data
-            else:
+            if index != -1 and commands[index].get('overridable') is False:
                 return ''
 
-            data.commands = list(commands.values())
-
-            with json_path.open(mode='w', encoding='utf8') as json_file, module_path.open(mode='w', encoding='utf8') as module_file:
-                json.dump(data, json_file, indent=2)
-                json_file.write('\n')
-                module_file.writelines(lines)
-
-            self.command_data = data.commands
-            self.commands[new_data.name] = Command(commands[new_data.name], self)
+            commands = commands.copy()
+            if index == -1:
+                commands.append(new_data)
+            else:
+                commands[index] = new_data
+
+            # Write the module first, so commands.json never lists a module that hasn't been written yet
+            temp_path: Path = module_path.with_name(f'{module_path.name}.{os.getpid()}.tmp')
+            temp_path.write_text(''.join(lines), encoding='utf8')
+            # Atomically replace, so a partially written module is never loaded
+            os.replace(temp_path, module_path)
+            # The new module may share a modification time and size with the old one
+            _BYTECODE_CACHE.pop(str(module_path), None)
+            self._write_json({**raw_json, 'commands': commands})
+
+            index = _find_command(self.command_data, new_data.name)
+            if index == -1:
+                self.command_data.append(new_data)
+            else:
+                self.command_data[index] = new_data
+            command: Command = Command(new_data, self)
+            if command._function is None:
+                # Load immediately, so a broken module is discarded instead of added
+                self._load_module(command)
+                if _find_command(self.command_data, new_data.name) == -1:
+                    return ''
+            self.commands[new_data.name] = command
 
             return new_data.name
 
@@ -466,23 +770,26 @@ class CommandParser:
         :param name: Name of command to remove.
         :return: {name} if successful, else empty string.
         """
-        json_path:   Path = self.path / 'commands.json'
-        module_path: Path = self.path / f'zzz__{name}.py'
-
-        with json_path.open(mode='r', encoding='utf8') as file:
-            data: ParserData = ParserData(json.load(file))
-
-        commands: dict[str, CommandData] = {command.name: command for command in data.commands}
+        module_path: Path = self._module_path(name)
 
-        if commands.get(name, CommandData.empty()).overridable is False:
-            return ''
+        raw_json: dict[str, Any] = self._read_json()
+        commands: list[dict[str, Any]] = raw_json['commands']
+        index:    int = _find_command(commands, name)
+        listed:   bool = index != -1
+        removed:  bool = listed
 
-        removed: bool = commands.pop(name, None) is not None
-        data.commands = list(commands.values())
+        if listed:
+            if commands[index].get('overridable') is False:
+                return ''
 
-        with json_path.open(mode='w', encoding='utf8') as file:
-            json.dump(data, file, indent=2)
+            self._write_json({**raw_json, 'commands': commands[:index] + commands[index + 1:]})
 
+        _BYTECODE_CACHE.pop(str(module_path), None)
+        try:
+            _bytecode_cache_path(module_path).unlink(missing_ok=True)
+        except OSError:
+            # The bytecode cache is best-effort, and commands.json is already rewritten
+            pass
         try:
             module_path.unlink()
         except FileNotFoundError:
@@ -491,7 +798,8 @@ class CommandParser:
             removed = True
 
         if removed:
-            self.command_data = data.commands
+            if listed:
+                self.command_data = [data for data in self.command_data if data.name != name]
             self.commands.pop(name, None)
             return name
 
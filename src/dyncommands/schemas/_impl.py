@@ -40,6 +40,7 @@ class SchemaHolder(ABC, dict):
     It is recommended for all subclasses to define __slots__.
     """
     __slots__ = ()
+    __ATTRIBUTES: frozenset[str]  # Names in dir() of the class, which are looked up as attributes instead of keys
     __REF_CACHE: dict[str, type]
     _META_VALIDATOR: Validator = Draft7Validator  # jsonschema Validator to use
     _SCHEMA: dict[str, Any] = NotImplemented  # Must be overridden
@@ -58,6 +59,7 @@ class SchemaHolder(ABC, dict):
             cls._VALIDATOR = cls._META_VALIDATOR(cls._SCHEMA)
 
         cls.__REF_CACHE = {}
+        cls.__ATTRIBUTES = frozenset(dir(cls))
 
     @classmethod
     @abstractmethod
@@ -88,7 +90,7 @@ class SchemaHolder(ABC, dict):
         :raises KeyError: Key not defined in the schema properties.
         :raises TypeError: Key is not an instance of str.
         """
-        if key in dir(type(self)):
+        if key in type(self).__ATTRIBUTES:
             if key in super().__getattribute__('keys')() and not self._warned:
                 warn(f'Key "{key}" of {self.__repr__()} is both a dictionary key and an object attribute. '
                      f'Make sure to call {type(self).__name__}.get(key) to reliably get the key value.')
@@ -103,7 +105,7 @@ class SchemaHolder(ABC, dict):
         :raises KeyError: Key not defined in the schema properties.
         :raises TypeError: Key is not an instance of str.
         """
-        if key in dir(type(self)):
+        if key in type(self).__ATTRIBUTES:
             return super().__setattr__(key, value)
 
         self.__setitem__(key, value)
@@ -114,7 +116,7 @@ class SchemaHolder(ABC, dict):
         :raises KeyError: Key is either required or not defined in schema properties.
         :raises TypeError: Key is not an instance of str.
         """
-        if key in dir(type(self)):
+        if key in type(self).__ATTRIBUTES:
             return super().__delattr__(key)
 
         self.__delitem__(key)
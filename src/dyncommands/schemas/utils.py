@@ -2,7 +2,7 @@
 #                              MIT Licence (C) 2022 Cubicpath@Github                              #
 ###################################################################################################
 """Utils for the dyncommands.schemas package"""
-from importlib.resources import read_text
+from importlib.resources import read_binary
 from json import loads
 from typing import Any
 
@@ -17,4 +17,5 @@ def get_schema(name: str) -> dict[str, Any]:
     :raises FileNotFoundError: If name given does not exist as a resource.
     :raises ValueError: If __package__ of this module is None.
     """
-    return loads(read_text(__package__ or '', f'{name}.schema.json'))
+    # json decodes bytes directly, so the resource does not have to be decoded to text first
+    return loads(read_binary(__package__ or '', f'{name}.schema.json'))
@@ -3,12 +3,16 @@
 ###################################################################################################
 """Util functions, classes, and attributes for Dynamic Commands"""
 from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from collections.abc import MutableMapping
 from typing import Any
 from typing import SupportsIndex
-
-import requests
+from typing import TypeVar
 
 __all__ = (
+    'CaseInsensitiveDict',
     'DUMMY_FUNC',
     'get_raw_text',
     'ireplace',
@@ -16,6 +20,94 @@ __all__ = (
 )
 
 DUMMY_FUNC: Callable[[...], None] = lambda *args, **kwargs: None
+_NEVER: Callable[[str, Any], bool] = lambda attr, attr_val: False
+
+_VT = TypeVar('_VT')
+
+
+class CaseInsensitiveDict(MutableMapping[str, _VT]):
+    """Mapping with case-insensitive string keys, which remembers the case of the last key set.
+
+    Replaces :py:class:`requests.structures.CaseInsensitiveDict` so models don't have to import :py:mod:`requests`.
+    """
+    __slots__ = ('_data', '_keys')
+
+    def __init__(self, data: Any = None, **kwargs) -> None:
+        self._data: dict[str, _VT] = {}   # Lowercase key -> value
+        self._keys: dict[str, str] = {}   # Lowercase key -> original key
+        self.update({} if data is None else data, **kwargs)
+
+    def __setitem__(self, key: str, value: _VT) -> None:
+        lower: str = key.lower()
+        self._data[lower] = value
+        self._keys[lower] = key
+
+    def __getitem__(self, key: str) -> _VT:
+        return self._data[key.lower()]
+
+    def __delitem__(self, key: str) -> None:
+        lower: str = key.lower()
+        del self._data[lower]
+        del self._keys[lower]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key.lower() in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """:return: The value mapped to key, or default if not found. Looked up without raising a KeyError first."""
+        return self._data.get(key.lower(), default)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        """Remove key and return its value, lowercasing the key only once.
+
+        :raises KeyError: If the key is not found and no default is given.
+        """
+        lower: str = key.lower()
+        self._keys.pop(lower, None)
+        return self._data.pop(lower, *default)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys.values())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if not isinstance(other, CaseInsensitiveDict):
+            other = CaseInsensitiveDict(other)
+        return self._data == other._data
+
+    def __repr__(self) -> str:
+        return str(dict(self.items()))
+
+    def set_lower(self, lower_key: str, key: str, value: _VT) -> None:
+        """Set a value using a key that has already been lowercased.
+
+        :param lower_key: Lowercase version of key.
+        :param key: Key to remember the case of.
+        :param value: Value to map to the key.
+        """
+        self._data[lower_key] = value
+        self._keys[lower_key] = key
+
+    def pop_lower(self, lower_key: str) -> _VT:
+        """Remove a key that has already been lowercased and return its value.
+
+        :param lower_key: Lowercase key to remove.
+        :raises KeyError: If the key is not found.
+        """
+        del self._keys[lower_key]
+        return self._data.pop(lower_key)
+
+    def copy(self) -> 'CaseInsensitiveDict[_VT]':
+        """:return: A shallow copy of this mapping."""
+        return CaseInsensitiveDict(self)
+
+    def lower_items(self) -> Iterable[tuple[str, _VT]]:
+        """:return: Key-value pairs with lowercase keys."""
+        return self._data.items()
 
 
 class PrivateProxy:
@@ -23,8 +115,8 @@ class PrivateProxy:
 
     # pylint: disable=eval-used
     def __init__(self, o: object,
-                 exclude_predicate: Callable[[str, Any], bool] = lambda attr, attr_val: False,
-                 include_predicate: Callable[[str, Any], bool] = lambda attr, attr_val: False,
+                 exclude_predicate: Callable[[str, Any], bool] = _NEVER,
+                 include_predicate: Callable[[str, Any], bool] = _NEVER,
                  starting_underscore_private: bool = True):
         """Object that proxies another object's attributes, created to prevent methods from accessing private data.
 
@@ -38,9 +130,15 @@ class PrivateProxy:
         :arg starting_underscore_private: All attributes starting with an underscore are by default private if True.
         """
 
+        # Private attributes can only be proxied through the include_predicate
+        skip_private: bool = starting_underscore_private and include_predicate is _NEVER
+
         for attr in dir(o):
+            if skip_private and attr.startswith('_'):
+                # Don't get the value of an attr that is never proxied
+                continue
             attr_val:   Any = getattr(o, attr)
-            is_private: bool = exclude_predicate(attr, attr_val) or (attr.startswith('_') and starting_underscore_private)
+            is_private: bool = (attr.startswith('_') and starting_underscore_private) or exclude_predicate(attr, attr_val)
             if is_private and include_predicate(attr, attr_val) is False:
                 # Don't proxy attr
                 continue
@@ -54,6 +152,8 @@ def get_raw_text(link: str) -> str:
     :param link: Original link to get text from.
     :return: raw text from link.
     """
+    import requests  # pylint: disable=import-outside-toplevel  # Only needed for fetching links
+
     headers: dict[str, str] = {'Accept': 'text'}
     sites: tuple[str, ...] = ('gist.github.com', 'rentry.co', 'pastebin.com', 'pastes.io', 'hastebin.com')
     if not link.startswith('https://'):
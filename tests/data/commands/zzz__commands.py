@@ -13,7 +13,7 @@ def command(*args, **kwargs):
     )
     source = context.source
     if len(args) == 0:
-        source.send_feedback(f"Your available commands are: {', '.join([name for name in {name: cmd for name, cmd in parser.commands.items() if source.has_permission(cmd.permission) and not cmd.disabled}])}", to=source.display_name)
+        source.send_feedback(f"Your available commands are: {', '.join([cmd.name for cmd in parser.available_commands(source)])}", to=source.display_name)
     elif len(args) == 1 and getitem(args, 0) == 'reload':
         parser.reload()
         source.send_feedback("Parser data has been synced with new data!", to=source.display_name)
@@ -0,0 +1,39 @@
+###################################################################################################
+#                              MIT Licence (C) 2022 Cubicpath@Github                              #
+###################################################################################################
+"""Tests for the __init__.py module."""
+import sys
+import unittest
+from pathlib import Path
+
+import dyncommands
+
+# Boilerplate to allow running script directly.
+if __name__ == '__main__' and __package__ is None: sys.path.insert(1, str(Path(__file__).resolve().parent.parent)); __package__ = 'tests'
+
+
+class TestLazyAttributes(unittest.TestCase):
+    def test_getattr(self) -> None:
+        """Lazy resolution of public attributes"""
+        from dyncommands.parser import CommandParser
+        self.assertIs(dyncommands.CommandParser, CommandParser)
+        self.assertIs(vars(dyncommands)['CommandParser'], CommandParser)
+        self.assertRaises(AttributeError, getattr, dyncommands, 'NotAnAttribute')
+
+    def test_all(self) -> None:
+        """Every name in __all__ resolves to a lazy attribute"""
+        self.assertEqual(sorted(dyncommands.__all__), sorted(dyncommands._LAZY_ATTRS))
+        for name in dyncommands.__all__:
+            self.assertIsNotNone(getattr(dyncommands, name))
+
+    def test_dir(self) -> None:
+        """All public attributes are listed, loaded or not"""
+        for name in dyncommands.__all__ + ('__version__', '__author__'):
+            self.assertIn(name, dir(dyncommands))
+        # Names only imported for use inside the package are not exported
+        for name in ('import_module', 'TYPE_CHECKING', 'Any'):
+            self.assertNotIn(name, dir(dyncommands))
+
+
+if __name__ == '__main__':
+    unittest.main()
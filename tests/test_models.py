@@ -2,6 +2,7 @@
 #                              MIT Licence (C) 2022 Cubicpath@Github                              #
 ###################################################################################################
 """Tests for the models.py module."""
+import operator
 import sys
 import unittest
 from pathlib import Path
@@ -32,8 +33,21 @@ class TestNode(unittest.TestCase):
         self.assertEqual(child.children, {})
         self.assertEqual(child.disabled, False)
 
+        # Nodes without children share read-only empty children
+        self.assertIs(child.children, Node().children)
+        self.assertRaises(TypeError, operator.setitem, child.children, 'key', Node())
+        self.assertIsNot(parent.children, child.children)
+
         self.assertRaises(ValueError, Node, unexpected='unexpected')
 
+    def test_init_children(self) -> None:
+        """Children nodes built from dictionary datasets"""
+        node = Node(name='parent', children=[{'name': 'Child', 'children': [{'name': 'grandchild', 'permission': 5}]}])
+        self.assertEqual(list(node.children), ['Child'])
+        self.assertIs(node.children['child'].parent, node)
+        self.assertEqual(node.children['child'].children['grandchild'].permission, 5)
+        self.assertEqual(str(node.children['child'].children['grandchild']), 'root:__parent__Child__grandchild')
+
     def test_str(self) -> None:
         """__str__ dunder"""
         node = Node()
@@ -51,6 +65,22 @@ class TestNode(unittest.TestCase):
         node.name = 'dif'
         self.assertEqual(str(second), 'root:__dif__child__second')
 
+        second.parent = node
+        self.assertEqual(str(second), 'root:__dif__second')
+
+    def test_eq(self) -> None:
+        """Equality of nodes in separate trees"""
+        first = Node(name='root', children=[{'name': 'child'}])
+        second = Node(name='root', children=[{'name': 'child'}])
+        self.assertEqual(first.children['child'], second.children['child'])
+        second.name = 'other'
+        self.assertNotEqual(first.children['child'], second.children['child'])
+        self.assertNotEqual(first, 'root')
+
+        # Names containing the path separator don't match a deeper node
+        self.assertNotEqual(Node(name='root__child'), first.children['child'])
+        self.assertNotEqual(first.children['child'], Node(name='child'))
+
     def test_children(self) -> None:
         """Children node objects"""
         parent = Node()
@@ -76,6 +106,13 @@ class TestNode(unittest.TestCase):
         parent.remove_children(child, second)
         self.assertEqual(parent.children, {})
 
+        # Remove non-existent children
+        self.assertNotEqual(child, 'new')
+        parent.add_children(child)
+        parent.remove_children('NEW', Node(name='new'), 'nonexistent')
+        self.assertEqual(parent.children, {})
+        self.assertIsNone(child.parent)
+
     def test_recursive_parent(self) -> None:
         """Parent is itself"""
         node = Node()
@@ -112,6 +149,11 @@ class TestCommandContext(unittest.TestCase):
         context = CommandContext('working string')
         self.assertEqual(context.working_string, 'working string')
         self.assertEqual(str(context.source), str(CommandSource()))
+        self.assertIs(context.source, CommandContext().source)
+        # The shared source cannot be modified
+        self.assertRaises(AttributeError, setattr, context.source, 'permission', 1000)
+        self.assertRaises(AttributeError, delattr, context.source, 'display_name')
+        self.assertEqual(context.source.permission, 0)
 
     def test_properties(self) -> None:
         """Test properties"""
@@ -7,13 +7,21 @@ import random
 import string
 import sys
 import unittest
+from importlib.metadata import PackageNotFoundError
 from pathlib import Path
 from shutil import copytree
 from shutil import rmtree
+from unittest import mock
 
 from dyncommands import *
+from dyncommands._version import __version__
 from dyncommands.exceptions import *
+from dyncommands.parser import _BYTECODE_CACHE
+from dyncommands.parser import _bytecode_tag
 from dyncommands.schemas import CommandData
+from dyncommands.utils import CaseInsensitiveDict
+from dyncommands.utils import DUMMY_FUNC
+from dyncommands.utils import PrivateProxy
 from dyncommands.utils import get_raw_text
 
 # Boilerplate to allow running script directly.
@@ -22,9 +30,10 @@ if __name__ == '__main__' and __package__ is None: sys.path.insert(1, str(Path(_
 temp_path = Path(__file__).parent / 'data/temp/commands'
 
 
-def make_parser_env():
-    rmtree(temp_path, ignore_errors=True)
-    copytree(temp_path.parent.parent / 'commands', temp_path)
+def make_parser_env(path: Path = temp_path) -> Path:
+    rmtree(path, ignore_errors=True)
+    copytree(temp_path.parent.parent / 'commands', path)
+    return path
 
 
 class TestExceptions(unittest.TestCase):
@@ -49,6 +58,14 @@ class TestExceptions(unittest.TestCase):
         e = CommandError(self.test_command, self.test_context)
         self.error_assert(e)
         self.assertEqual(f"'{e.context.source.display_name}' failed executing the '{e.command.name}' command.", str(e))
+        self.assertIs(CommandError(self.test_command, self.test_context, e).parent, e)
+
+        # The parent can be reassigned
+        e.parent = ValueError()
+        self.assertIsInstance(e.parent, ValueError)
+        e.parent = e
+        self.assertIs(e.parent, e)
+        self.assertIsNone(e._parent)
         self.test_context = CommandContext('!commands a', self.test_context.source)
 
     def test_DisabledError(self) -> None:
@@ -66,6 +83,7 @@ class TestExceptions(unittest.TestCase):
         e = ImproperUsageError(self.test_command, self.test_context)
         self.error_assert(e)
         self.assertEqual(f"Incorrect usage of '{e.command.name}'. To view usage information, use '!#prefix#!help {e.command.name}'.", str(e))
+        self.assertEqual('Custom message', str(ImproperUsageError(self.test_command, self.test_context, 'Custom message')))
         self.test_context = CommandContext('!commands a b', self.test_context.source)
         self.assertRaises(ImproperUsageError, self.parser.parse, self.test_context)
 
@@ -89,6 +107,9 @@ class TestExceptions(unittest.TestCase):
         if type(e) is CommandError: self.assertIsNone(e.parent)
         else: self.assertIs(e, e.parent)
         self.assertIs(self.test_context, e.context)
+        # The message is formatted when raised, and kept in args
+        self.assertEqual(e.args, (str(e),))
+        self.assertEqual(repr(e), f'{type(e).__name__}({str(e)!r})')
         self.assertIs(self.test_command, e.command or self.test_command)
 
 
@@ -116,6 +137,12 @@ class TestCommandParser(unittest.TestCase):
         sys.stdout = self.old_stdout
         self.parser.prefix = self.original_prefix
 
+    def isolated_path(self) -> Path:
+        """:return: A copy of the commands directory, removed after the current test."""
+        path = make_parser_env(temp_path.parent / self._testMethodName)
+        self.addCleanup(rmtree, path)
+        return path
+
     def test_add_command(self) -> None:
         """Adding commands, both normal and those with errors"""
         broken_command_link = 'https://gist.github.com/Cubicpath/8fc611ca67bf2d17e03b4766a816596a'
@@ -124,12 +151,19 @@ class TestCommandParser(unittest.TestCase):
         command2 = (self.parser.path / 'test-no-command.txt').read_text(encoding='utf8')
         command3 = (self.parser.path / 'test-docstring.txt').read_text(encoding='utf8')
         command4 = (self.parser.path / 'test-metadata-error.txt').read_text(encoding='utf8')
-        self.assertEqual(self.parser.add_command(text=broken_command_link, link=True), 'broken')
+        self.assertEqual(self.parser.add_command(text=broken_command_link, link=True), '')
+        # Commands whose module fails to load are discarded, not added
+        self.assertEqual(self.parser.add_command('def raises(x=1 // 0):\n    pass\n'), '')
+        self.assertNotIn('raises', self.parser.commands)
+        self.assertFalse((self.parser.path / 'zzz__raises.py').exists())
         self.assertEqual(self.parser.add_command(text=command0), '')
         self.assertEqual(self.parser.add_command(text=command1), 'test')
         self.assertEqual(self.parser.add_command(text=command2), '')
         self.assertEqual(self.parser.add_command(text=command3), 'test-docstring')
+        self.assertNotIn('remove me', (self.parser.path / 'zzz__test-docstring.py').read_text(encoding='utf8'))
         self.assertEqual(self.parser.add_command(text=command4), 'test-metadata-error')
+        # Modules and commands.json are written through temporary files
+        self.assertEqual(list(self.parser.path.glob('*.tmp')), [])
         self.parser.reload()
         self.assertEqual(self.parser.commands['test'].name, 'test')
         self.assertEqual(self.parser.commands['test'].usage, 'test [*args:Any]')
@@ -137,9 +171,228 @@ class TestCommandParser(unittest.TestCase):
         self.assertEqual(self.parser.commands['test'].permission, 500)
         self.assertEqual(self.parser.commands['test'].children, {})
         self.assertEqual(self.parser.commands['test-metadata-error'].permission, 0)
+
+        # Metadata keys without a value are ignored
+        self.assertEqual(self.parser.add_command('# Name\n# Permission\ndef novalue():\n    pass\n'), 'novalue')
+        self.assertEqual(self.parser.remove_command('novalue'), 'novalue')
+
+        # Single-line docstrings are cut after their closing marker
+        self.assertEqual(self.parser.add_command('\'\'\'A docstring\'\'\' junk\ndef trimmed():\n    return 1\n'), 'trimmed')
+        self.assertTrue((self.parser.path / 'zzz__trimmed.py').read_text(encoding='utf8').startswith('\'\'\'A docstring\'\'\'\n'))
+        self.parser.remove_command('trimmed')
+
+        # Children as Python literals or JSON
+        self.parser.add_command('# Children: [{"name": "it\'s", \'disabled\': True}]\ndef literal():\n    pass\n')
+        self.parser.add_command('# Children: [{"name": "child", "disabled": true}]\ndef json():\n    pass\n')
+        self.assertTrue(self.parser.commands['literal'].children["it's"].disabled)
+        self.assertTrue(self.parser.commands['json'].children['child'].disabled)
+        self.parser.remove_command('literal')
+        self.parser.remove_command('json')
+
+        # Children that are not a list of objects are ignored
+        for children in ('{[]: 1}', '{1, 2}', '[1, 2]', '"text"', '[' * 1000):
+            self.assertEqual(self.parser.add_command(f'# Children: {children}\ndef ignored():\n    pass\n'), 'ignored')
+            self.assertEqual(self.parser.commands['ignored'].children, {})
+        self.parser.remove_command('ignored')
+        # Command data in memory follows commands.json
+        self.assertEqual([data.name for data in self.parser.command_data], [data['name'] for data in self.parser._read_json()['commands']])
         self.assertIsNone(self.parser.commands.get('broken'))
         self.assertRaises(FileNotFoundError, CommandParser, 'bad_path')
 
+    def test_available_commands(self) -> None:
+        """Filtering commands by permission and disabled state"""
+        self.test_source.permission = 500
+        self.assertIn(self.parser.commands['test'], self.parser.available_commands(self.test_source))
+        self.parser.set_disabled('test', True)
+        self.assertNotIn(self.parser.commands['test'], self.parser.available_commands(self.test_source))
+        self.parser.set_disabled('test', False)
+        self.test_source.permission = 0
+        self.assertNotIn(self.parser.commands['test'], self.parser.available_commands(self.test_source))
+        self.parser._ignore_permission = True
+        self.addCleanup(setattr, self.parser, '_ignore_permission', False)
+        self.assertEqual(list(self.parser.commands.values()), self.parser.available_commands(self.test_source))
+        self.parser._ignore_permission = False
+
+        # Feedback from the commands command
+        self.parser.parse(CommandContext(self.parser.prefix + 'commands', self.test_source))
+        self.assertEqual(self.feedback, 'Your available commands are: ' + ', '.join(command.name for command in self.parser.available_commands(self.test_source)))
+
+    def test_bytecode_cache(self) -> None:
+        """Caching compiled command modules"""
+        _BYTECODE_CACHE.clear()
+        cache_dir = self.parser.path / '__pycache__'
+        cache_path = cache_dir / 'zzz__test.dyncommands.pyc'
+        module_path = self.parser.path / 'zzz__test.py'
+
+        # Bytecode is only cached on disk when enabled
+        rmtree(cache_dir, ignore_errors=True)
+        self.parser._compile_module(module_path)
+        self.assertFalse(cache_path.exists())
+        _BYTECODE_CACHE.clear()
+
+        self.parser._cache_bytecode = True
+        self.addCleanup(setattr, self.parser, '_cache_bytecode', False)
+        byte_code = self.parser._compile_module(module_path)
+        self.assertTrue(cache_path.is_file())
+
+        # Bytecode compiled in this process is reused, without reading the cache file
+        cached = cache_path.read_bytes()
+        cache_path.write_bytes(b'')
+        self.assertIs(self.parser._compile_module(module_path), byte_code)
+
+        # Cached bytecode is reused
+        _BYTECODE_CACHE.clear()
+        cache_path.write_bytes(cached)
+        self.assertEqual(self.parser._compile_module(module_path).co_filename, str(module_path))
+        self.assertEqual(cached, cache_path.read_bytes())
+
+        # Corrupt cache is recompiled and replaced
+        _BYTECODE_CACHE.clear()
+        cache_path.write_bytes(cached[:20])
+        self.parser._compile_module(module_path)
+        self.assertEqual(cached, cache_path.read_bytes())
+
+        # Cache directory cannot be created
+        _BYTECODE_CACHE.clear()
+        rmtree(cache_dir)
+        cache_dir.write_bytes(b'')
+        self.assertEqual(self.parser._compile_module(module_path).co_filename, str(module_path))
+        cache_dir.unlink()
+
+        # Invalid UTF-8 is reported as a SyntaxError
+        bad_path = self.parser.path / 'zzz__bad-encoding.py'
+        bad_path.write_bytes(b'def command():\n    return "\xff"\n')
+        self.assertRaises(SyntaxError, self.parser._compile_module, bad_path)
+        bad_path.unlink()
+
+    def test_bytecode_tag(self) -> None:
+        """Bytecode cache keys include the versions of dyncommands and RestrictedPython"""
+        _bytecode_tag.cache_clear()
+        self.addCleanup(_bytecode_tag.cache_clear)
+        self.assertIn(f'dyncommands {__version__} RestrictedPython '.encode('utf8'), _bytecode_tag())
+        self.assertTrue(_bytecode_tag().endswith(b'_CommandPolicy'))
+
+        # RestrictedPython without distribution metadata
+        _bytecode_tag.cache_clear()
+        with mock.patch('importlib.metadata.version', side_effect=PackageNotFoundError):
+            self.assertIn(b'RestrictedPython unknown', _bytecode_tag())
+
+        # Only computed when bytecode is cached on disk
+        _bytecode_tag.cache_clear()
+        _BYTECODE_CACHE.clear()
+        self.parser._compile_module(self.parser._module_path('test'))
+        self.assertEqual(_bytecode_tag.cache_info().currsize, 0)
+
+    def test_compile_modules(self) -> None:
+        """Compiling command modules ahead of time"""
+        _BYTECODE_CACHE.clear()
+        self.parser._cache_bytecode = True
+        self.addCleanup(setattr, self.parser, '_cache_bytecode', False)
+        compiled = self.parser.compile_modules()
+        self.assertIn('test', compiled)
+        self.assertNotIn('test-no-function', compiled)
+        self.assertIn(str(temp_path / 'zzz__test.py'), _BYTECODE_CACHE)
+        self.assertTrue((temp_path / '__pycache__' / 'zzz__test.dyncommands.pyc').exists())
+
+    def test_lazy_load(self) -> None:
+        """Loading command modules on first execution, or during reload when preloading"""
+        path = self.isolated_path()
+        parser = CommandParser(path, silent=True)
+        self.assertIsNone(parser.commands['test']._function)
+        parser.parse(CommandContext(parser.prefix + 'test-no-function', self.test_source))
+        self.assertIs(parser.commands['test-no-function']._function, DUMMY_FUNC)
+
+        # The unrestricted command can't be compiled in restricted mode, and is discarded
+        parser = CommandParser(path, silent=True, preload=True)
+        self.assertIsNot(parser.commands['test']._function, DUMMY_FUNC)
+        self.assertNotIn('unrestricted', parser.commands)
+        self.assertNotIn('unrestricted', [command.name for command in parser.command_data])
+        self.assertFalse((path / 'zzz__unrestricted.py').exists())
+
+    def test_module_body_error(self) -> None:
+        """Modules whose body raises are discarded when first executed"""
+        path = self.isolated_path()
+        parser = CommandParser(path, silent=True)
+        (path / 'zzz__test.py').write_text('x = 1 // 0\n\ndef command(*args, **kwargs):\n    return 1\n', encoding='utf8')
+        self.test_source.permission = 1000
+        parser.parse(CommandContext(parser.prefix + 'test', self.test_source))
+        self.assertEqual(self.feedback, '')
+        self.assertNotIn('test', parser.commands)
+        self.assertFalse((path / 'zzz__test.py').exists())
+
+    def test_json_cache(self) -> None:
+        """commands.json is only decoded again after it changes"""
+        first = self.parser._read_json()
+        self.assertIs(self.parser._read_json(), first)
+        self.parser.prefix = '$'
+        self.assertIsNot(self.parser._read_json(), first)
+        self.assertEqual(self.parser._read_json()['commandPrefix'], '$')
+        self.assertEqual(first['commandPrefix'], self.original_prefix)
+
+    def test_path(self) -> None:
+        """Paths of files in the commands directory follow the path attribute"""
+        parser = CommandParser(str(temp_path), silent=True)
+        self.assertEqual(parser.path, temp_path)
+        self.assertEqual(parser._json_path, temp_path / 'commands.json')
+        parser.path = 'bad_path'
+        self.assertEqual(parser._module_path('test'), Path('bad_path', 'zzz__test.py'))
+        self.assertRaises(FileNotFoundError, parser.reload)
+
+    def test_proxy_kwargs(self) -> None:
+        """Immutable builtin kwargs are passed without a proxy"""
+        self.parser.add_command('def kwarg_types(*_, **kwargs):\n    return kwargs[\'text\'] + str(kwargs[\'number\'] + 1)\n')
+        self.test_source.permission = 1000
+        self.parser.parse(CommandContext('kwarg-types', self.test_source), text='value', number=1)
+        self.assertEqual(self.feedback, 'value2')
+        self.parser.remove_command('kwarg-types')
+
+    def test_reload(self) -> None:
+        """Commands with unchanged data are kept between reloads"""
+        test_command = self.parser.commands['test']
+        other_command = self.parser.commands['test-no-function']
+        self.parser.set_disabled('test-no-function', True)
+        self.parser.reload()
+        self.assertIs(self.parser.commands['test'], test_command)
+        self.assertIsNot(self.parser.commands['test-no-function'], other_command)
+        self.parser.set_disabled('test-no-function', False)
+
+        # The commands dict is only built once when no module is discarded
+        with mock.patch('dyncommands.parser.CaseInsensitiveDict', wraps=CaseInsensitiveDict) as dict_type:
+            self.parser.reload()
+        self.assertEqual(dict_type.call_count, 1)
+
+        # Reloading an unchanged commands.json does not rebuild the command data
+        self.parser.reload()
+        command_data = self.parser.command_data
+        self.parser.reload()
+        self.assertIs(self.parser.command_data, command_data)
+
+        # Loaded modules are reloaded if they have changed
+        path = self.isolated_path()
+        parser = CommandParser(path, silent=True, preload=True)
+        test_function = parser.commands['test']._function
+        parser.reload()
+        self.assertIs(parser.commands['test']._function, test_function)
+        module_path = path / 'zzz__test.py'
+        module_path.write_text(module_path.read_text(encoding='utf8') + '\n', encoding='utf8')
+        parser.reload()
+        self.assertIsNot(parser.commands['test']._function, test_function)
+        self.assertIsNotNone(parser.commands['test']._function)
+
+        # Modules that failed to load are retried, while commands without modules are left alone
+        parser.commands['test']._function = DUMMY_FUNC
+        parser.reload()
+        self.assertIsNot(parser.commands['test']._function, DUMMY_FUNC)
+        self.assertIs(parser.commands['test-no-function']._function, DUMMY_FUNC)
+
+        # Broken modules are discarded when preloading, even if commands.json is unchanged
+        self.assertEqual(parser.add_command('def broken_reload(*args, **kwargs):\n    pass\n'), 'broken-reload')
+        parser.reload()
+        (path / 'zzz__broken-reload.py').write_text('def command(:\n', encoding='utf8')
+        parser.reload()
+        self.assertNotIn('broken-reload', parser.commands)
+        self.assertNotIn('broken-reload', [command.name for command in parser.command_data])
+
     def test_parse(self) -> None:
         """Command parsing"""
         for substring_tup in [(char,) for char in string.printable.rstrip(string.whitespace)] + [('!#',)] + [('(5352)',)]:
@@ -150,6 +403,11 @@ class TestCommandParser(unittest.TestCase):
         self.parser.parse(context)
         self.assertEqual(self.feedback, f"'{context.working_string.strip()}' is correct usage of the 'test' command.")
 
+        # Trailing unicode tag characters are ignored
+        self.feedback = ''
+        self.parser.parse(CommandContext('test \U000e0000\U000e0000', self.test_source))
+        self.assertTrue(self.feedback.endswith("is correct usage of the 'test' command."))
+
     def test_remove_command(self) -> None:
         """Removing commands"""
         # Test overridable as false
@@ -164,13 +422,45 @@ class TestCommandParser(unittest.TestCase):
         self.assertEqual(self.parser.remove_command('test-no-function'), 'test-no-function')
         self.assertNotIn('test-no-function', self.parser.commands)
 
+        # Cached bytecode is removed with the module
+        self.parser._cache_bytecode = True
+        self.addCleanup(setattr, self.parser, '_cache_bytecode', False)
+        self.parser.add_command('def cached():\n    pass\n')
+        cache_path = temp_path / '__pycache__' / 'zzz__cached.dyncommands.pyc'
+        self.assertTrue(cache_path.exists())
+        self.assertEqual(self.parser.remove_command('cached'), 'cached')
+        self.assertFalse(cache_path.exists())
+
+        # Removal still completes if the cache cannot be removed
+        self.parser.add_command('def uncached():\n    pass\n')
+        rmtree(cache_path.parent)
+        cache_path.parent.write_bytes(b'')
+        self.addCleanup(cache_path.parent.unlink)
+        self.assertEqual(self.parser.remove_command('uncached'), 'uncached')
+        self.assertNotIn('uncached', self.parser.commands)
+        self.assertFalse((temp_path / 'zzz__uncached.py').exists())
+
+    def test_should_hide_attr(self) -> None:
+        """Hiding protected and Path attributes, remembered per name and type"""
+        for _ in range(2):
+            self.assertTrue(self.parser._should_hide_attr('_protected_attribute', object()))
+            self.assertTrue(self.parser._should_hide_attr('path_object', temp_path))
+            self.assertFalse(self.parser._should_hide_attr('_proxy', PrivateProxy(object())))
+            self.assertFalse(self.parser._should_hide_attr('public_attribute', object()))
+        self.assertIn(('path_object', type(temp_path)), self.parser._hidden_attrs)
+
     def test_set_disabled(self) -> None:
         """Disabling commands"""
         self.assertFalse(self.parser.set_disabled('commands', True))
+        decoded = self.parser._read_json()
         self.assertTrue(self.parser.set_disabled('test', True))
+        # The previously decoded commands.json is left unchanged
+        self.assertNotIn(True, [command.get('disabled') for command in decoded['commands']])
         self.assertFalse(self.parser.commands['commands'].disabled)
         self.assertTrue(self.parser.commands['test'].disabled)
+        self.assertTrue(next(command for command in self.parser._read_json()['commands'] if command['name'] == 'test')['disabled'])
         self.parser.set_disabled('test', False)
+        self.assertFalse(self.parser.set_disabled('mc983jn784', True))
 
     def test_silent(self) -> None:
         """CommandParser.print silent mode"""
@@ -194,7 +484,7 @@ class TestCommandParser(unittest.TestCase):
         self.assertEqual(self.parser.prefix, prefix)
         self.assertRaises(NotFoundError, self.parser.parse, context)
 
-    def feedback_receiver(self, s: str, *_) -> None:
+    def feedback_receiver(self, s: str, *_, **__) -> None:
         self.feedback = s
 
 
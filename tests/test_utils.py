@@ -6,6 +6,8 @@ import sys
 import unittest
 from pathlib import Path
 
+from dyncommands._version import __version__
+from dyncommands._version import __version_info__
 from dyncommands._version import _stringify as version_stringify
 from dyncommands.utils import *
 
@@ -45,6 +47,16 @@ class TestPrivateProxy(unittest.TestCase):
         self.assertRaises(TypeError, proxy.__ge__)
         self.assertRaises(TypeError, proxy.__le__)
 
+    def test_private_values_not_read(self) -> None:
+        """Values of private attrs are only read when they may be included"""
+        class Guarded:
+            @property
+            def _secret(self) -> str:
+                raise RuntimeError('Private attribute was read')
+
+        self.assertNotIn('_secret', dir(PrivateProxy(Guarded())))
+        self.assertRaises(RuntimeError, PrivateProxy, Guarded(), include_predicate=lambda attr, *_: False)
+
     def test_remove_single_attr(self) -> None:
         """Exclusion of single attr"""
         proxy = PrivateProxy('foo')
@@ -59,6 +71,56 @@ class TestPrivateProxy(unittest.TestCase):
         self.assertRaises(AttributeError, lambda: proxy.isalpha())
 
 
+class TestCaseInsensitiveDict(unittest.TestCase):
+    """Tests for CaseInsensitiveDict."""
+
+    def setUp(self) -> None:
+        self.dict = CaseInsensitiveDict({'Foo': 1}, BAR=2)
+
+    def test_lookup(self) -> None:
+        """Case-insensitive key lookup"""
+        self.assertEqual(self.dict['foo'], 1)
+        self.assertEqual(self.dict['FOO'], 1)
+        self.assertEqual(self.dict.get('bar'), 2)
+        self.assertEqual(self.dict.get('baz', 3), 3)
+        self.assertIn('fOo', self.dict)
+        self.assertNotIn(1, self.dict)
+        self.assertRaises(KeyError, lambda: self.dict['baz'])
+
+    def test_preserve_case(self) -> None:
+        """Iteration uses the case of the last key set"""
+        self.assertEqual(list(self.dict), ['Foo', 'BAR'])
+        self.dict['foo'] = 3
+        self.assertEqual(list(self.dict.items()), [('foo', 3), ('BAR', 2)])
+        self.assertEqual(list(self.dict.lower_items()), [('foo', 3), ('bar', 2)])
+        self.assertEqual(repr(self.dict), "{'foo': 3, 'BAR': 2}")
+
+    def test_mutation(self) -> None:
+        """Deleting, popping, and copying"""
+        copy = self.dict.copy()
+        del self.dict['FOO']
+        self.assertEqual(self.dict.pop('bar'), 2)
+        self.assertIsNone(self.dict.pop('bar', None))
+        self.assertRaises(KeyError, self.dict.pop, 'bar')
+        self.assertEqual(len(self.dict), 0)
+        self.assertRaises(KeyError, self.dict.__delitem__, 'foo')
+        self.assertEqual(len(copy), 2)
+
+        # Pre-lowercased keys
+        copy.set_lower('baz', 'BaZ', 3)
+        self.assertEqual(copy['BAZ'], 3)
+        self.assertEqual(list(copy)[-1], 'BaZ')
+        self.assertEqual(copy.pop_lower('baz'), 3)
+        self.assertRaises(KeyError, copy.pop_lower, 'baz')
+
+    def test_eq(self) -> None:
+        """Equality with other mappings"""
+        self.assertEqual(self.dict, {'foo': 1, 'bar': 2})
+        self.assertEqual(self.dict, CaseInsensitiveDict(FOO=1, bar=2))
+        self.assertNotEqual(self.dict, {'foo': 1})
+        self.assertNotEqual(self.dict, [('foo', 1), ('bar', 2)])
+
+
 class TestFunctions(unittest.TestCase):
     """Tests for utils functions."""
 
@@ -101,11 +163,13 @@ class TestFunctions(unittest.TestCase):
 
     def test_version_stringify(self) -> None:
         """_version.py stringify checks"""
+        self.assertEqual(version_stringify(*__version_info__), __version__)
         self.assertEqual(version_stringify(2021, 9), '2021.9')
         self.assertEqual(version_stringify(0, 3, 2, 'beta'), '0.3.2b')
         self.assertEqual(version_stringify(1, 0, 0, 'release'), '1.0')
         self.assertEqual(version_stringify(3, 10, 0, 'candidate', 0), '3.10rc')
         self.assertEqual(version_stringify(3, 9, 1, 'alpha', 3), '3.9.1a3')
+        self.assertEqual(version_stringify(3, 9, 1, 'c', 1, pre_sep='-', pre_ver_sep='.'), '3.9.1-rc.1')
         self.assertEqual(version_stringify(3, 9, 1, dev=2), '3.9.1.dev2')
         self.assertEqual(version_stringify(20, 45, 0, dev=2, dev_sep='_', dev_post=1, post_spelling='r'), '20.45_dev2.r1')
         self.assertEqual(version_stringify(3, 9, 2, 'preview', 3, post=0, post_implicit=True, dev=5), '3.9.2pre3-0.dev5')